@@ -0,0 +1,148 @@
+# Program: Inbound parser microbenchmark
+# Purpose: Compare the stock irc.client line parser against the filtering
+# fast path in inbound.py over server traffic
+"""
+Microbenchmark for inbound line parsing.
+
+Usage: python bench/bench_inbound.py [traffic file] [repeats]
+
+The traffic file holds one raw line per line, as read from the server.
+By default it is synthetic_traffic.txt, written by make_traffic.py; pass
+a capture from a real network to measure that instead.
+
+Both connections are given the handlers PluginBot registers, and each is
+timed twice. With "no-op" handlers nothing reads the events, so only
+parsing and dispatch are timed and lazy decoding is never paid for. With
+"bot-like" handlers the all_events dispatcher formats every event that
+PluginBot has an on_<type> method for, as those methods do with str(e),
+so the lazy events get fully decoded.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Used for interacting with IRC
+import irc.client
+import inbound
+from irc_plugin_bot import PluginBot
+
+default_traffic = os.path.join(
+    os.path.dirname(__file__),
+    "synthetic_traffic.txt"
+)
+
+
+def make_connection(reactor_class, template, callback, dispatcher=None):
+    """
+    Build an unconnected ServerConnection whose reactor has a handler
+    for every event type the `template` reactor does.
+    `reactor_class` -> Reactor class to instantiate
+    `template` -> Reactor of a PluginBot
+    `callback` -> Handler to register in place of the bot's own
+    `dispatcher` -> Handler for "all_events", if not `callback`
+    """
+    reactor = reactor_class()
+    reactor.dispatched = template.dispatched
+    connection = inbound.offline_connection(reactor, "PluginBot")
+    for event_type in template.handlers:
+        if event_type == "all_events" and dispatcher is not None:
+            reactor.add_global_handler(event_type, dispatcher)
+        else:
+            reactor.add_global_handler(event_type, callback)
+    return connection
+
+
+def record(events):
+    def callback(connection, event):
+        events.append((event.type, str(event)))
+    return callback
+
+
+def ignore(connection, event):
+    pass
+
+
+def read(dispatched):
+    """
+    Stand-in for PluginBot's dispatcher: every event it has an on_<type>
+    method for gets formatted, the way on_pubmsg and friends print it.
+    """
+    def dispatcher(connection, event):
+        if event.type in dispatched:
+            str(event)
+    return dispatcher
+
+
+def check(lines, template):
+    """
+    Make sure the fast path delivers exactly the events the stock parser
+    does, minus the ones nothing listens for.
+    """
+    stock_events, fast_events = [], []
+    stock = make_connection(irc.client.Reactor, template, record(stock_events))
+    fast = make_connection(
+        inbound.FilteringReactor,
+        template,
+        record(fast_events)
+    )
+    for line in lines:
+        stock._process_line(line)
+        fast._process_line(line)
+    # Lines handed to the stock parser still emit all_raw_messages.
+    wanted = [e for e in stock_events if fast.wants(e[0])]
+    if wanted != [e for e in fast_events if fast.wants(e[0])]:
+        sys.exit("Fast path events differ from the stock parser's.")
+    return len(stock_events), len(fast_events)
+
+
+def run(connection, lines):
+    process = connection._process_line
+    for line in lines:
+        process(line)
+
+
+def main():
+    traffic = sys.argv[1] if len(sys.argv) > 1 else default_traffic
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with open(traffic, encoding="utf-8") as f:
+        lines = [line.rstrip("\r\n") for line in f if line.strip()]
+
+    bot = PluginBot("#bots", "PluginBot", "PluginBot", "localhost")
+    template = bot.reactor
+    stock_count, fast_count = check(lines, template)
+    print("%d lines: %d handler calls stock, %d fast path" % (
+        len(lines), stock_count, fast_count
+    ))
+
+    for handlers, dispatcher in [
+        ("no-op", None),
+        ("bot-like", read(template.dispatched)),
+    ]:
+        print("%s handlers:" % handlers)
+        results = {}
+        for name, reactor_class in [
+            ("stock", irc.client.Reactor),
+            ("fast", inbound.FilteringReactor),
+        ]:
+            connection = make_connection(
+                reactor_class,
+                template,
+                ignore,
+                dispatcher
+            )
+            best = min(timeit.repeat(
+                lambda: run(connection, lines),
+                number=1,
+                repeat=repeats
+            ))
+            results[name] = best
+            print("  %-5s %8.2f ms/pass %8.2f us/line" % (
+                name, best * 1e3, best * 1e6 / len(lines)
+            ))
+        print("  speedup: %.2fx" % (results["stock"] / results["fast"]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Program: Synthetic traffic generator
+# Purpose: Write the synthetic server traffic used by bench_inbound.py
+"""
+Generate synthetic IRC server traffic for bench_inbound.py.
+
+Usage: python bench/make_traffic.py [output file] [lines] [seed]
+
+The output is not captured from a real network. It is a seeded random mix
+shaped like a busy server: a connection burst (welcome numerics, MOTD,
+joins and NAMES), then mostly channel PRIVMSG with some CTCP ACTIONs,
+private messages, bot commands, notices, joins, parts, quits, aways,
+modes, topics, PINGs and nick changes. About a third of the lines carry
+IRCv3 tags. The message text is random words.
+"""
+
+import os
+import random
+import sys
+
+default_output = os.path.join(
+    os.path.dirname(__file__),
+    "synthetic_traffic.txt"
+)
+
+nicks = [
+    "alice", "bob", "carol", "dave", "erin", "frank",
+    "grace", "heidi", "ivan", "judy", "mallory", "oscar"
+]
+chans = ["#bots", "#python", "#linux", "#offtopic", "#help"]
+words = (
+    "the a bot plugin server channel why does this not work anyone know "
+    "how to fix it lol ok thanks yes no maybe later build test release "
+    "patch merge"
+).split()
+
+
+def mask(nick):
+    return "%s!~%s@user/%s" % (nick, nick, nick)
+
+
+def text(rng):
+    return " ".join(
+        rng.choice(words) for _ in range(rng.randint(2, 14))
+    )
+
+
+def burst(rng):
+    """
+    Lines a server sends right after the bot connects.
+    """
+    lines = [
+        ":irc.example.com NOTICE * :*** Looking up your hostname...",
+        ":irc.example.com 001 PluginBot "
+        ":Welcome to the Example IRC Network PluginBot",
+        ":irc.example.com 002 PluginBot :Your host is irc.example.com",
+        ":irc.example.com 005 PluginBot CHANTYPES=# NETWORK=Example "
+        "PREFIX=(ov)@+ :are supported by this server",
+        ":irc.example.com 375 PluginBot "
+        ":- irc.example.com Message of the Day -",
+    ]
+    for _ in range(20):
+        lines.append(":irc.example.com 372 PluginBot :- " + text(rng))
+    lines.append(":irc.example.com 376 PluginBot :End of /MOTD command.")
+    for chan in chans:
+        lines.append(":PluginBot!~PluginBot@example.com JOIN " + chan)
+        lines.append(
+            ":irc.example.com 332 PluginBot %s :%s" % (chan, text(rng))
+        )
+        lines.append(":irc.example.com 353 PluginBot = %s :PluginBot %s" % (
+            chan,
+            " ".join(nicks)
+        ))
+        lines.append(
+            ":irc.example.com 366 PluginBot %s :End of /NAMES list." % chan
+        )
+    return lines
+
+
+def traffic_line(rng):
+    """
+    One line of ordinary traffic once the bot is settled in.
+    """
+    r = rng.random()
+    nick = rng.choice(nicks)
+    chan = rng.choice(chans)
+    tags = ""
+    if rng.random() < 0.4:
+        tags = "@time=2026-10-%02dT12:%02d:%02d.000Z;account=%s " % (
+            rng.randint(1, 28),
+            rng.randint(0, 59),
+            rng.randint(0, 59),
+            nick
+        )
+    source = tags + ":" + mask(nick)
+    if r < 0.72:
+        return "%s PRIVMSG %s :%s" % (source, chan, text(rng))
+    elif r < 0.76:
+        return "%s PRIVMSG %s :\x01ACTION %s\x01" % (source, chan, text(rng))
+    elif r < 0.78:
+        return "%s PRIVMSG PluginBot :%s" % (source, text(rng))
+    elif r < 0.80:
+        return ":%s PRIVMSG %s :!pb %s %s" % (
+            mask(nick),
+            chan,
+            rng.choice(["say", "help", "do"]),
+            text(rng)
+        )
+    elif r < 0.83:
+        return ":%s NOTICE %s :%s" % (mask(nick), chan, text(rng))
+    elif r < 0.86:
+        return "%s JOIN %s" % (source, chan)
+    elif r < 0.89:
+        return "%s PART %s :%s" % (source, chan, text(rng))
+    elif r < 0.91:
+        return ":%s QUIT :Quit: %s" % (mask(nick), text(rng))
+    elif r < 0.93:
+        return ":%s AWAY :%s" % (mask(nick), text(rng))
+    elif r < 0.95:
+        return ":%s MODE %s +v %s" % (mask(nick), chan, rng.choice(nicks))
+    elif r < 0.96:
+        return ":%s TOPIC %s :%s" % (mask(nick), chan, text(rng))
+    elif r < 0.98:
+        return "PING :irc.example.com"
+    else:
+        return ":%s NICK %s_" % (mask(nick), nick)
+
+
+def main():
+    output = sys.argv[1] if len(sys.argv) > 1 else default_output
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 26
+    rng = random.Random(seed)
+    lines = burst(rng)
+    lines.extend(traffic_line(rng) for _ in range(count))
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == '__main__':
+    main()
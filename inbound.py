@@ -0,0 +1,255 @@
+# Inbound: Fast path for lines coming in from the IRC server
+"""
+Parse-time filtering for inbound IRC lines.
+
+irc.client.ServerConnection turns every line into a fully parsed Event
+before anything gets to decide whether it cares about it. The classes here
+look at just the command and target first, drop lines that nothing is
+listening for, and build the common PRIVMSG/NOTICE events with their tags
+and arguments left undecoded until something asks for them.
+"""
+
+# Used for caching command lookups
+import functools
+# Used for interacting with IRC
+import irc.client
+import irc.events
+import irc.message
+
+# Commands that ServerConnection._process_line uses to update the state of
+# the connection. These always take the full path, wanted or not.
+STATEFUL_COMMANDS = frozenset(["nick", "welcome", "featurelist"])
+
+
+@functools.lru_cache(maxsize=256)
+def lookup_command(raw):
+    """
+    Translate a raw command or numeric into its event type, the same way
+    irc.client does, caching the most recently seen ones.
+    Example:
+    >>> lookup_command("PRIVMSG")
+    'privmsg'
+    >>> lookup_command("001")
+    'welcome'
+    """
+    return irc.events.Command.lookup(raw)
+
+
+def scan_line(line):
+    """
+    Split a raw line into its tags, prefix, command and parameters without
+    decoding any of them. Returns None for lines that don't have a command.
+    Example:
+    >>> scan_line("@id=1 :nick!user@host PRIVMSG #bots :hi there")
+    ('id=1', 'nick!user@host', 'privmsg', '#bots :hi there')
+    >>> scan_line("PING :irc.example.com")
+    (None, None, 'ping', ':irc.example.com')
+    >>> scan_line(":irc.example.com 001 PluginBot :Welcome")
+    (None, 'irc.example.com', 'welcome', 'PluginBot :Welcome')
+    >>> scan_line("@id=1") is None
+    True
+    """
+    tags = prefix = None
+    if line.startswith("@"):
+        tags, _, line = line[1:].partition(" ")
+    if line.startswith(":"):
+        prefix, _, line = line[1:].partition(" ")
+        if not prefix:
+            return None
+        line = line.lstrip(" ")
+    command, _, params = line.partition(" ")
+    if not command:
+        return None
+    return tags or None, prefix, lookup_command(command), params
+
+
+def dispatched_types(obj):
+    """
+    Returns the set of event types that an irc.client.SimpleIRCClient will
+    dispatch to one of its on_<type> methods.
+    """
+    return frozenset(
+        name[len("on_"):] for name in dir(obj) if name.startswith("on_")
+    )
+
+
+class LazyEvent(irc.client.Event):
+    """
+    An Event whose arguments and tags are only decoded from the raw line
+    the first time they are used.
+    `raw_arguments` -> Parameters following the target, as on the wire
+    `raw_tags` -> Tag section of the line, without the leading "@"
+    Example:
+    >>> e = LazyEvent("pubmsg", None, "#bots", ":hi there", "a=1;b")
+    >>> e._arguments is None and e._tags is None
+    True
+    >>> e.arguments
+    ['hi there']
+    >>> e.tags
+    [{'key': 'a', 'value': '1'}, {'key': 'b', 'value': None}]
+    >>> LazyEvent("pubmsg", None, "#bots", "hi", None).tags
+    []
+    >>> e.arguments = ["bye"]
+    >>> e.tags = []
+    >>> print(e)
+    type: pubmsg, source: None, target: #bots, arguments: ['bye'], tags: []
+    """
+    def __init__(self, type, source, target, raw_arguments, raw_tags):
+        self.type = type
+        self.source = source
+        self.target = target
+        self._raw_arguments = raw_arguments
+        self._raw_tags = raw_tags
+        self._arguments = None
+        self._tags = None
+
+    def __str__(self):
+        tmpl = (
+            "type: {0.type}, "
+            "source: {0.source}, "
+            "target: {0.target}, "
+            "arguments: {0.arguments}, "
+            "tags: {0.tags}"
+        )
+        return tmpl.format(self)
+
+    @property
+    def arguments(self):
+        if self._arguments is None:
+            self._arguments = irc.message.Arguments.from_group(
+                " " + self._raw_arguments
+            )
+        return self._arguments
+
+    @arguments.setter
+    def arguments(self, value):
+        self._arguments = value
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = irc.message.Tag.from_group(self._raw_tags) or []
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = value
+
+
+class FilteringServerConnection(irc.client.ServerConnection):
+    """
+    A ServerConnection that drops inbound lines nothing is listening for
+    before parsing them, and builds plain PRIVMSG and NOTICE events lazily.
+    Anything unusual is handed to the regular parser unchanged.
+    Example:
+    >>> reactor = FilteringReactor()
+    >>> connection = offline_connection(reactor, "PluginBot")
+    >>> reactor.add_global_handler("pubmsg", lambda c, e: print(e.arguments))
+    >>> connection._process_line(":n!u@h NOTICE #bots :dropped")
+    >>> connection._process_line(":n!u@h PRIVMSG #bots :hi there")
+    ['hi there']
+    """
+
+    def wants(self, event_type):
+        """
+        Returns true or false based on whether an event of the specified
+        type would reach a handler.
+        """
+        if event_type in self.handlers:
+            return True
+        reactor = self.reactor
+        if reactor.handlers.get(event_type):
+            return True
+        if reactor.handlers.get("all_events"):
+            return (
+                reactor.dispatched is None
+                or event_type in reactor.dispatched
+            )
+        return False
+
+    def _process_line(self, line):
+        scanned = scan_line(line)
+        if scanned is None or self.wants("all_raw_messages"):
+            super()._process_line(line)
+            return
+        tags, prefix, command, params = scanned
+
+        if command in STATEFUL_COMMANDS:
+            super()._process_line(line)
+            return
+
+        if prefix and not self.real_server_name:
+            self.real_server_name = irc.client.NickMask(prefix)
+
+        if command == "privmsg" or command == "notice":
+            self._process_message(line, tags, prefix, command, params)
+        elif self.wants(command) or (
+            command == "mode" and self.wants("umode")
+        ):
+            super()._process_line(line)
+
+    def _process_message(self, line, tags, prefix, command, params):
+        """
+        Fast path for PRIVMSG and NOTICE lines carrying a single plain text
+        message. Everything else (CTCP, odd spacing) takes the full path.
+        """
+        # Arguments.from_group splits on any whitespace, not just spaces, so
+        # anything that wouldn't survive str.split() intact goes to it.
+        target, sep, text = params.lstrip(" ").partition(" ")
+        if not sep or target.startswith(":") or target.split() != [target]:
+            super()._process_line(line)
+            return
+        if text.startswith(":"):
+            message = text[1:]
+        elif text.split() == [text]:
+            message = text
+        else:
+            super()._process_line(line)
+            return
+        if "\x01" in message or "\x10" in message:
+            super()._process_line(line)
+            return
+
+        if irc.client.is_channel(target):
+            event_type = "pubmsg" if command == "privmsg" else "pubnotice"
+        else:
+            event_type = "privmsg" if command == "privmsg" else "privnotice"
+        if not self.wants(event_type):
+            return
+
+        self._handle_event(LazyEvent(
+            event_type,
+            irc.client.NickMask.from_group(prefix),
+            target,
+            text,
+            tags
+        ))
+
+
+class FilteringReactor(irc.client.Reactor):
+    """
+    A Reactor whose server connections filter inbound lines.
+
+    `dispatched` is the set of event types the "all_events" handlers care
+    about. Leave it as None to have every event treated as wanted whenever
+    an "all_events" handler is registered.
+    """
+    connection_class = FilteringServerConnection
+    dispatched = None
+
+
+def offline_connection(reactor, nickname):
+    """
+    Returns a server connection on `reactor` that is set up the way
+    ServerConnection.connect() would leave it, without opening a socket,
+    so lines can be fed to it directly. The reactor stops answering PINGs,
+    since there is nowhere to send the reply.
+    `reactor` -> Reactor to create the connection on
+    `nickname` -> Nickname the connection believes it has
+    """
+    reactor.remove_global_handler("ping", irc.client._ping_ponger)
+    connection = reactor.server()
+    connection.handlers = {}
+    connection.real_server_name = ""
+    connection.real_nickname = nickname
+    return connection
@@ -14,6 +14,8 @@ import irc.connection
 import ssl
 import channel
 import user
+# Used for dropping unwanted lines before they're parsed
+import inbound
 # Plugins
 from plugin_mount import ActionProvider
 # Allow the bot to quit
@@ -37,6 +39,8 @@ class PluginBot(irc.bot.SingleServerIRCBot):
     """
     The main bot definition
     """
+    reactor_class = inbound.FilteringReactor
+
     def __init__(
         self,
         def_channel,
@@ -54,6 +58,8 @@ class PluginBot(irc.bot.SingleServerIRCBot):
             realname,
             **self.__connect_params
         )
+        # Only the events we have an on_ method for are worth parsing
+        self.reactor.dispatched = inbound.dispatched_types(self)
         self.channel = def_channel
         self.plugin_cmd_prefixes = []
         self.plugin_cmds = []
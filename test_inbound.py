@@ -0,0 +1,118 @@
+"""
+Checks that inbound.FilteringServerConnection delivers the same events as
+irc.client.ServerConnection. Run with: python -m doctest test_inbound.py
+
+Each line is fed to both connections, given handlers for the listed event
+types. compare() prints the type, target and arguments of every event the
+fast path delivered, after checking that the full events match.
+>>> compare("@a=1 :n!u@h PRIVMSG #bots :hi there", "pubmsg")
+pubmsg #bots ['hi there']
+>>> compare(":n!u@h PRIVMSG PluginBot :hi", "privmsg", "pubmsg")
+privmsg PluginBot ['hi']
+>>> compare(":n!u@h NOTICE #bots :hi", "pubnotice", "privnotice")
+pubnotice #bots ['hi']
+>>> compare(":n!u@h NOTICE PluginBot :hi", "pubnotice", "privnotice")
+privnotice PluginBot ['hi']
+>>> compare(":n!u@h PRIVMSG #bots :", "pubmsg")
+pubmsg #bots ['']
+>>> compare(":n!u@h PRIVMSG #bots hi", "pubmsg")
+pubmsg #bots ['hi']
+
+Lines the fast path can't build exactly go to the stock parser.
+>>> compare(":n!u@h PRIVMSG #bots hi there", "pubmsg")
+pubmsg #bots ['hi']
+>>> compare(":n!u@h PRIVMSG   #bots  :hi", "pubmsg")
+pubmsg #bots ['hi']
+>>> compare(":n!u@h PRIVMSG #bots\\t:hi x", "pubmsg")
+pubmsg #bots [':hi']
+>>> compare(":n!u@h PRIVMSG #bo\\xa0ts :hi", "pubmsg")
+pubmsg #bo ['ts']
+>>> compare(":n!u@h PRIVMSG #bots :\\x01ACTION waves\\x01",
+...         "pubmsg", "ctcp", "action")
+ctcp #bots ['ACTION', 'waves']
+action #bots ['waves']
+>>> compare(":n!u@h PRIVMSG #bots :a\\x10nb", "pubmsg")
+pubmsg #bots ['a\\nb']
+
+A PRIVMSG with no text fails the same way on both paths.
+>>> compare(":n!u@h PRIVMSG #bots", "pubmsg")
+raised ValueError
+
+MODE becomes umode when its target isn't a channel.
+>>> compare(":n!u@h MODE PluginBot +i", "umode")
+umode PluginBot ['+i']
+>>> compare(":n!u@h MODE #bots +v n", "mode")
+mode #bots ['+v', 'n']
+>>> compare(":n!u@h MODE PluginBot +i", "mode")
+
+Lines of a type nothing wants are dropped.
+>>> fast, events = connect(
+...     inbound.FilteringReactor, ["all_events"], frozenset(["pubmsg"]))
+>>> fast.wants("pubmsg"), fast.wants("pubnotice")
+(True, False)
+>>> fast._process_line(":n!u@h NOTICE #bots :hi")
+>>> fast._process_line(":n!u@h TOPIC #bots :hi")
+>>> events
+[]
+>>> fast._process_line(":n!u@h PRIVMSG #bots :hi")
+>>> [event.type for event in events]
+['pubmsg']
+
+Connection state is kept up to date even with no handlers at all.
+>>> fast, events = connect(inbound.FilteringReactor, [])
+>>> fast._process_line(":irc.example.com 001 PB :Welcome")
+>>> fast.real_server_name, fast.real_nickname
+('irc.example.com', 'PB')
+>>> fast._process_line(":PB!u@h NICK PluginBot")
+>>> fast.real_nickname
+'PluginBot'
+>>> fast._process_line(
+...     ":irc.example.com 005 PluginBot NETWORK=Example :are supported")
+>>> fast.features.network
+'Example'
+>>> events
+[]
+"""
+
+# Used for interacting with IRC
+import irc.client
+import inbound
+
+
+def connect(reactor_class, types, dispatched=None):
+    """
+    Returns an offline connection with a handler for each of `types`, and
+    the list those handlers append events to.
+    """
+    reactor = reactor_class()
+    reactor.dispatched = dispatched
+    events = []
+    for event_type in types:
+        reactor.add_global_handler(
+            event_type,
+            lambda c, e: events.append(e)
+        )
+    return inbound.offline_connection(reactor, "PluginBot"), events
+
+
+def compare(line, *types):
+    """
+    Feed `line` to a stock and a filtering connection with handlers for
+    `types`, and print what the filtering one delivered if both agree.
+    """
+    results = []
+    for reactor_class in [irc.client.Reactor, inbound.FilteringReactor]:
+        connection, events = connect(reactor_class, types)
+        try:
+            connection._process_line(line)
+        except Exception as exc:
+            results.append("raised " + type(exc).__name__)
+        else:
+            results.append([str(event) for event in events])
+    if results[0] != results[1]:
+        print("MISMATCH", results)
+    elif isinstance(results[1], str):
+        print(results[1])
+    else:
+        for event in events:
+            print(event.type, event.target, event.arguments)